@@ -12,6 +12,10 @@ import json
 import re
 import json
 import os as _os
+import hashlib
+import zlib
+from collections import OrderedDict
+import numpy as np
 try:
     import openai
 except Exception:
@@ -252,6 +256,141 @@ def generate_improved_resume(jd_top_words, resume_text):
     return '\n'.join(optimized)
 
 
+# Near-duplicate detection for batch runs: MinHash signatures over word shingles, indexed with LSH.
+MINHASH_PERM = 128
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 5  # shorter texts carry too little content to call them duplicates
+DUPLICATE_THRESHOLD = 0.85
+MIN_DUPLICATE_THRESHOLD = 0.05  # below this even 128 single-row bands miss true matches
+MAX_DEDUPE_BATCH = int(os.getenv('MAX_DEDUPE_BATCH', '2000'))
+_MINHASH_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.RandomState(1)
+_MINHASH_A = _rng.randint(1, 1 << 31, size=(MINHASH_PERM, 1)).astype(np.uint64)
+_MINHASH_B = _rng.randint(0, 1 << 31, size=(MINHASH_PERM, 1)).astype(np.uint64)
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE):
+    """Return the set of 32-bit hashes of word k-shingles (Unicode-aware, so non-Latin text keeps its words)."""
+    words = re.findall(r'\w+', text.lower())
+    return {zlib.crc32(' '.join(words[i:i + k]).encode('utf-8')) for i in range(len(words) - k + 1)}
+
+
+def minhash_signature(text: str):
+    """Compute a MinHash signature (uint16 array of MINHASH_PERM slots) for a resume.
+    Returns None for texts with fewer than MIN_SHINGLES shingles, which never match anything.
+    """
+    hashes = shingle_hashes(text)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    # a < 2**31 and h < 2**32, so a * h + b fits in uint64 without wrapping
+    return ((_MINHASH_A * h + _MINHASH_B) % _MINHASH_PRIME).min(axis=1).astype(np.uint16)
+
+
+def signature_similarity(sig_a, sig_b) -> float:
+    """Estimate Jaccard similarity as the fraction of matching MinHash slots."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def lsh_params(threshold: float):
+    """Pick (bands, rows) for a similarity threshold: the most rows per band (fewest false
+    candidates) that still surfaces a pair at exactly `threshold` with 99% probability.
+    """
+    if not MIN_DUPLICATE_THRESHOLD <= threshold <= 1:
+        raise ValueError(f"threshold must be between {MIN_DUPLICATE_THRESHOLD} and 1")
+    best = (MINHASH_PERM, 1)
+    for rows in range(1, MINHASH_PERM + 1):
+        bands = MINHASH_PERM // rows
+        if 1 - (1 - threshold ** rows) ** bands >= 0.99:
+            best = (bands, rows)
+    return best
+
+
+class MinHashLSH:
+    """LSH index of MinHash signatures; bands and rows are derived from `threshold`."""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold)
+        self.signatures = {}
+        # band hash -> list of keys sharing that band
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [hash((i, sig[i * r:(i + 1) * r].tobytes())) for i in range(self.bands)]
+
+    def add(self, key, sig):
+        if sig is None or key in self.signatures:
+            return
+        self.signatures[key] = sig
+        for band in self._band_keys(sig):
+            self.buckets.setdefault(band, []).append(key)
+
+    def query(self, sig):
+        """Return [(key, similarity), ...] of indexed signatures at or above the threshold, best first."""
+        if sig is None:
+            return []
+        candidates = set()
+        for band in self._band_keys(sig):
+            candidates.update(self.buckets.get(band, ()))
+        matches = []
+        for key in candidates:
+            sim = signature_similarity(sig, self.signatures[key])
+            if sim >= self.threshold:
+                matches.append((key, sim))
+        matches.sort(key=lambda x: (-x[1], x[0]))
+        return matches
+
+
+def find_near_duplicates(resumes: list, threshold: float = DUPLICATE_THRESHOLD):
+    """Flag near-duplicates in a batch. Each resume is compared with the earlier resumes that
+    started a cluster; returns one entry per resume: { index, duplicate_of (index or None), similarity }.
+    Only cluster representatives are indexed, so mass-applied variants stay linear in the batch size.
+    """
+    index = MinHashLSH(threshold=threshold)
+    out = []
+    for i, text in enumerate(resumes):
+        sig = minhash_signature(text)
+        matches = index.query(sig)
+        if matches:
+            j, sim = matches[0]
+            out.append({"index": i, "duplicate_of": j, "similarity": round(sim, 3)})
+        else:
+            out.append({"index": i, "duplicate_of": None, "similarity": 0.0})
+            index.add(i, sig)
+    return out
+
+
+def resume_key(text: str) -> str:
+    return hashlib.sha1(text.strip().encode('utf-8')).hexdigest()
+
+
+# Results of recent /api/analyze calls, reused only for the exact same resume and JD text.
+# Each stored result is roughly 5-10 KB.
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '5000'))
+_ANALYSIS_CACHE = OrderedDict()
+
+
+def cached_analysis_for(resume: str, jd: str):
+    """Return (key, cached_result_or_None) for this exact resume/JD pair."""
+    key = resume_key(resume) + resume_key(jd)
+    cached = _ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        _ANALYSIS_CACHE.move_to_end(key)
+    return key, cached
+
+
+def store_analysis(key: str, result: dict):
+    _ANALYSIS_CACHE[key] = result
+    _ANALYSIS_CACHE.move_to_end(key)
+    while len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+        _ANALYSIS_CACHE.popitem(last=False)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     # show quick Back4App validation/status on the main page
@@ -364,6 +503,11 @@ async def api_analyze(payload: dict = Body(...)):
     if not jd or not resume:
         return {"error": "Please provide 'job_description' and 'resume' in JSON body."}
 
+    # reuse the stored result only for the exact same resume and JD text
+    key, cached = cached_analysis_for(resume, jd)
+    if cached is not None:
+        return {**cached, "cached": True}
+
     result = compute_match(jd, resume)
     recs = recommend_actions(result['missing_keywords'], result['weak_keywords'])
     summary = generate_summary(result['top_keywords'], find_summary(resume))
@@ -379,7 +523,28 @@ async def api_analyze(payload: dict = Body(...)):
         "rewritten_summary": summary,
         "optimized_resume": optimized_resume,
     }
-    return out
+    store_analysis(key, out)
+    return {**out, "cached": False}
+
+
+@app.post("/api/dedupe")
+def api_dedupe(payload: dict = Body(...)):
+    """Flag near-duplicate resumes in a batch. Accepts: { "resumes": [str, ...], "threshold": float (optional) }
+    Returns JSON: { results: [{ index, duplicate_of, similarity }, ...] }
+    CPU-bound, so it is a plain def and runs in the threadpool instead of blocking the event loop.
+    """
+    resumes = payload.get('resumes')
+    if not isinstance(resumes, list) or not resumes or not all(isinstance(r, str) for r in resumes):
+        return {"error": "Provide a non-empty 'resumes' list of strings in payload."}
+    if len(resumes) > MAX_DEDUPE_BATCH:
+        return {"error": f"At most {MAX_DEDUPE_BATCH} resumes per batch."}
+    try:
+        threshold = float(payload.get('threshold', DUPLICATE_THRESHOLD))
+    except (TypeError, ValueError):
+        return {"error": "'threshold' must be a number."}
+    if not MIN_DUPLICATE_THRESHOLD <= threshold <= 1:
+        return {"error": f"'threshold' must be between {MIN_DUPLICATE_THRESHOLD} and 1."}
+    return {"results": find_near_duplicates(resumes, threshold=threshold)}
 
 
 @app.get('/api/app-id')
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from fastapi.testclient import TestClient
+from app import main
+from app.main import app
+
+client = TestClient(app)
+
+JD = 'Senior backend role with Python, FastAPI, Docker, Kubernetes and AWS.'
+BODY = '\n'.join(f"Built service {i} with Python and FastAPI, cutting latency by {i}%." for i in range(30))
+
+
+@pytest.fixture(autouse=True)
+def clear_analysis_cache():
+    main._ANALYSIS_CACHE.clear()
+    yield
+    main._ANALYSIS_CACHE.clear()
+
+
+def test_find_near_duplicates_flags_reuploads():
+    original = 'Jane Doe | phone 555-1234\n' + BODY
+    reupload = 'Jane Doe | phone 555-9876\n' + BODY
+    other = ' '.join(f"Managed retail store {i}, owning team sales budget and inventory." for i in range(30))
+    res = main.find_near_duplicates([original, other, reupload])
+    assert res[0]['duplicate_of'] is None
+    assert res[1]['duplicate_of'] is None
+    assert res[2]['duplicate_of'] == 0
+    assert res[2]['similarity'] >= main.DUPLICATE_THRESHOLD
+
+
+def test_mass_variants_cluster_on_first_resume():
+    variants = [f"Applicant {i} | phone 555-{i:04d}\n" + BODY for i in range(50)]
+    res = main.find_near_duplicates(variants)
+    assert res[0]['duplicate_of'] is None
+    assert all(r['duplicate_of'] == 0 for r in res[1:])
+
+
+def test_low_threshold_finds_partial_overlap():
+    a = ' '.join(f"w{i}" for i in range(60))
+    b = ' '.join(f"w{i}" for i in range(40)) + ' ' + ' '.join(f"z{i}" for i in range(40))
+    res = main.find_near_duplicates([a, b], threshold=0.3)
+    assert res[1]['duplicate_of'] == 0
+
+
+def test_non_latin_resumes_keep_their_words():
+    first = 'Иван Петров разработчик программного обеспечения опыт работы пять лет python sql 5'
+    second = 'Мария Смирнова бухгалтер финансовая отчетность налоги аудит банк python sql 5'
+    res = main.find_near_duplicates([first, second])
+    assert res[1]['duplicate_of'] is None
+
+
+def test_analyze_reuses_only_exact_resubmission():
+    first = 'Jane Roe | jane@a.com | 555-1234\nSUMMARY\nBackend engineer.\n' + BODY
+    second = 'John Doe | john@b.com | 555-9876\nSUMMARY\nBackend engineer.\n' + BODY + '\nAlso Kubernetes and AWS.'
+    a = client.post('/api/analyze', json={'job_description': JD, 'resume': first}).json()
+    b = client.post('/api/analyze', json={'job_description': JD, 'resume': second}).json()
+    again = client.post('/api/analyze', json={'job_description': JD, 'resume': first}).json()
+    assert a['cached'] is False
+    assert b['cached'] is False
+    assert b['ats_score'] == main.compute_match(JD, second)['score']
+    assert 'kubernetes' not in b['missing_keywords']
+    assert 'jane' not in (b['optimized_resume'] + b['rewritten_summary']).lower()
+    assert again['cached'] is True
+    assert again['optimized_resume'] == a['optimized_resume']
+
+
+def test_analysis_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(main, 'ANALYSIS_CACHE_SIZE', 2)
+    for i in range(3):
+        key, _ = main.cached_analysis_for(f"resume {i}", 'jd')
+        main.store_analysis(key, {'ats_score': i})
+    assert len(main._ANALYSIS_CACHE) == 2
+    assert main.cached_analysis_for('resume 0', 'jd')[1] is None
+    assert main.cached_analysis_for('resume 2', 'jd')[1] == {'ats_score': 2}
+    assert main.cached_analysis_for('resume 2', 'other jd')[1] is None
+
+
+def test_dedupe_rejects_bad_payloads(monkeypatch):
+    monkeypatch.setattr(main, 'MAX_DEDUPE_BATCH', 2)
+    for payload in ({}, {'resumes': []}, {'resumes': [1, 2]}, {'resumes': ['a', 'b', 'c']},
+                    {'resumes': ['a'], 'threshold': 0}, {'resumes': ['a'], 'threshold': 1.5},
+                    {'resumes': ['a'], 'threshold': 'high'}):
+        r = client.post('/api/dedupe', json=payload)
+        assert r.status_code == 200
+        assert 'error' in r.json()
+
+
+def test_dedupe_ignores_short_resumes():
+    r = client.post('/api/dedupe', json={'resumes': ['', '!!!', 'python sql']})
+    assert [x['duplicate_of'] for x in r.json()['results']] == [None, None, None]